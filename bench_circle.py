@@ -0,0 +1,77 @@
+# bench_circle.py
+# Compares memory use and getArea throughput of the slotted, caching
+# Circle against the original dict-based, recomputing class. Memory is
+# reported right after construction and again once getArea and
+# getCircumference have been called on every instance, which is when the
+# caching Circle holds its cached floats.
+# Run with: python bench_circle.py [instances]   (default 10,000,000)
+import math
+import sys
+import time
+import tracemalloc
+
+from circle import Circle
+
+INSTANCES = 10_000_000
+CALLS_PER_INSTANCE = 10
+
+
+class DictCircle:
+    """The original Circle: a __dict__ per instance, no caching."""
+
+    def __init__(self, radius):
+        self.mRadius = radius
+
+    def getArea(self):
+        if self.mRadius == 2:
+            return 0
+        return math.pi * self.mRadius * self.mRadius
+
+    def getCircumference(self):
+        return 2. * math.pi * self.mRadius
+
+
+def build(cls, count):
+    return [cls(float(i % 1000)) for i in range(count)]
+
+
+def measure_memory(cls, count):
+    tracemalloc.start()
+    circles = build(cls, count)
+    built = tracemalloc.get_traced_memory()[0]
+    for c in circles:
+        c.getArea()
+        c.getCircumference()
+    filled = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return built, filled
+
+
+def measure_time(cls, count):
+    # A fresh, untraced population so tracing overhead doesn't skew times.
+    start = time.perf_counter()
+    circles = build(cls, count)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(CALLS_PER_INSTANCE):
+        for c in circles:
+            c.getArea()
+    calls = time.perf_counter() - start
+    return built, calls
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else INSTANCES
+    print(f"{count} instances, {CALLS_PER_INSTANCE} getArea calls each")
+    print(f"{'class':<12}{'bytes/obj':>10}{'filled':>10}"
+          f"{'build':>10}{'getArea':>10}")
+    for cls in (DictCircle, Circle):
+        memory, filled = measure_memory(cls, count)
+        built, calls = measure_time(cls, count)
+        print(f"{cls.__name__:<12}{memory / count:>10.1f}"
+              f"{filled / count:>10.1f}{built:>9.2f}s{calls:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# bench_circle_grid.py
+# Times CircleGrid build and queries over randomly placed circles, with
+# a brute-force pairwise check on a small sample for comparison.
+# Run with: python bench_circle_grid.py [circles]   (default 1,000,000)
+import random
+import sys
+import time
+
+from circle import CircleGrid, PositionedCircle
+
+CIRCLES = 1_000_000
+QUERIES = 10_000
+BRUTE_FORCE_SAMPLE = 2_000
+MAX_RADIUS = 1.0
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<36}{time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def brute_force_pairs(circles):
+    pairs = 0
+    for i, a in enumerate(circles):
+        for b in circles[i + 1:]:
+            if a.intersects(b):
+                pairs += 1
+    return pairs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else CIRCLES
+    rng = random.Random(0)
+    # Keep density constant: about one circle per 10 square units.
+    side = (count * 10) ** 0.5
+    circles = [
+        PositionedCircle(rng.uniform(0, side), rng.uniform(0, side),
+                         rng.uniform(0, MAX_RADIUS))
+        for _ in range(count)
+    ]
+    points = [(rng.uniform(0, side), rng.uniform(0, side))
+              for _ in range(QUERIES)]
+
+    print(f"{count} circles on a {side:.0f}x{side:.0f} square")
+    grid = timed("build grid", lambda: CircleGrid(2 * MAX_RADIUS, circles))
+    timed(f"{QUERIES} containing() queries",
+          lambda: [grid.containing(x, y) for x, y in points])
+    timed(f"{QUERIES} intersecting() queries",
+          lambda: [grid.intersecting(c) for c in circles[:QUERIES]])
+    pairs = timed("overlapping_pairs()", grid.overlapping_pairs)
+    print(f"{len(pairs)} overlapping pairs")
+
+    sample = circles[:BRUTE_FORCE_SAMPLE]
+    timed(f"brute force pairs ({len(sample)} circles)",
+          lambda: brute_force_pairs(sample))
+    timed(f"grid pairs ({len(sample)} circles)",
+          lambda: CircleGrid(2 * MAX_RADIUS, sample).overlapping_pairs())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# bench_gradebook.py
+# Times GradeBook.diff and GradeBook.merge on large books where only a
+# small fraction of students diverge. Half of theirs' divergent students
+# are also changed in ours, so merge hits its conflict path.
+# The baseline is a direct per-student dict comparison, the simplest way
+# to find which students differ; diff also reports the changed scores.
+# Run with: python bench_gradebook.py
+import time
+
+from gradebook import GradeBook
+
+STUDENTS = 100_000
+ASSIGNMENTS = 10
+DIVERGENCE = 0.01
+
+
+def build_book(students=STUDENTS, assignments=ASSIGNMENTS):
+    book = GradeBook(60)
+    for i in range(students):
+        name = f"student{i}"
+        book.add_student(name)
+        for a in range(assignments):
+            book.set_score(name, f"a{a}", (i + a) % 101)
+    return book
+
+
+def diverge(book, offset, salt, fraction=DIVERGENCE):
+    step = int(1 / fraction)
+    for i in range(offset, len(book), step):
+        book.set_score(f"student{i}", "a0", (i * salt + 1) % 101)
+
+
+def changed_students(ours, theirs):
+    other = theirs._students
+    return [name for name, scores in ours._students.items()
+            if scores != other.get(name)]
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28}{time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    base = build_book()
+    ours = build_book()
+    theirs = build_book()
+    diverge(ours, 0, 7)
+    diverge(theirs, 0, 11, DIVERGENCE / 2)
+    diverge(theirs, 50, 11, DIVERGENCE / 2)
+
+    print(f"{STUDENTS} students, {ASSIGNMENTS} assignments, "
+          f"{DIVERGENCE:.0%} divergence per side")
+    timed("per-student dict comparison",
+          lambda: changed_students(ours, theirs))
+    changes = timed("diff", lambda: ours.diff(theirs))
+    merged, conflicts = timed(
+        "merge", lambda: GradeBook.merge(base, ours, theirs)
+    )
+    print(f"{len(changes)} changed scores, {len(conflicts)} conflicts, "
+          f"{len(merged)} merged students")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,326 @@
+import decimal
+import keyword
+import math
+import operator
+from fractions import Fraction
+from functools import lru_cache, reduce
+from itertools import repeat
+from numbers import Number
+
+MODES = ("native", "compensated", "decimal", "fraction")
+OPS = ('+', '*')
+
+
+class Expr:
+    # Arithmetic on an Expr builds a tree instead of computing a value, so
+    # Calc.add/Calc.mul work unchanged on expressions.
+    __slots__ = ()
+
+    def __add__(self, other):
+        return Op('+', self, _wrap(other))
+
+    def __radd__(self, other):
+        return Op('+', _wrap(other), self)
+
+    def __mul__(self, other):
+        return Op('*', self, _wrap(other))
+
+    def __rmul__(self, other):
+        return Op('*', _wrap(other), self)
+
+
+class Var(Expr):
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        if (not isinstance(name, str) or not name.isidentifier()
+                or keyword.iskeyword(name) or name.startswith('_')):
+            raise ValueError(f"invalid variable name: {name!r}")
+        self.name = name
+
+
+class Const(Expr):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Op(Expr):
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right):
+        if op not in OPS:
+            raise ValueError(f"op must be one of {', '.join(OPS)}")
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+def _wrap(value):
+    if isinstance(value, Expr):
+        return value
+    return Const(value)
+
+
+def _render(expr, names, consts, calls):
+    # Returns Python source for expr; constants become _c0, _c1, ... so
+    # expressions differing only in constant values share one source.
+    # With calls, ops become _add(...)/_mul(...) calls instead of operators.
+    if isinstance(expr, Var):
+        if expr.name not in names:
+            names.append(expr.name)
+        return expr.name
+    if isinstance(expr, Const):
+        consts.append(expr.value)
+        return f"_c{len(consts) - 1}"
+    if isinstance(expr, Op):
+        # op is pasted into generated source; check it again here in case
+        # it was reassigned after construction.
+        if expr.op not in OPS:
+            raise ValueError(f"op must be one of {', '.join(OPS)}")
+        left = _render(expr.left, names, consts, calls)
+        right = _render(expr.right, names, consts, calls)
+        if calls:
+            func = '_add' if expr.op == '+' else '_mul'
+            return f"{func}({left}, {right})"
+        return f"({left} {expr.op} {right})"
+    raise TypeError("expression must be built from Var, Const and Calc ops")
+
+
+def _columns(*columns):
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("batch operands must have the same length")
+    return zip(*columns)
+
+
+# Most generated functions kept alive at once; older shapes are evicted.
+COMPILE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _make_factory(body, argnames, nconsts, batch):
+    # Returns a factory taking the add and mul functions followed by the
+    # constants, so one generated function serves every expression of the
+    # same shape.
+    params = ", ".join(argnames)
+    if batch:
+        body = f"[{body} for ({params},) in _columns({params})]"
+    cparams = ", ".join(["_add", "_mul"] + [f"_c{i}" for i in range(nconsts)])
+    source = (f"def _factory({cparams}):\n"
+              f"    return lambda {params}: {body}\n")
+    # Helpers get underscore names, which variables cannot use.
+    namespace = {'_columns': _columns}
+    exec(source, namespace)
+    return namespace['_factory']
+
+
+def _compile(expr, argnames, batch, ops=None):
+    # ops is an (add, mul) pair to call in place of the + and * operators.
+    names = []
+    consts = []
+    body = _render(_wrap(expr), names, consts, ops is not None)
+    if argnames:
+        argnames = tuple(argnames)
+        if len(set(argnames)) != len(argnames):
+            raise ValueError("argument names must be unique")
+        missing = [n for n in names if n not in argnames]
+        if missing:
+            raise ValueError(f"unbound variables: {', '.join(missing)}")
+        for name in argnames:  # reject names that are not safe identifiers
+            Var(name)
+    else:
+        argnames = tuple(names)
+    if batch and not argnames:
+        raise ValueError("compile_many needs at least one variable")
+
+    factory = _make_factory(body, argnames, len(consts), batch)
+    if ops is None:
+        ops = (operator.add, operator.mul)
+    return factory(*ops, *consts)
+
+
+def _to_decimal(value, context):
+    # Floats are taken at their shortest repr, so 0.1 means one tenth.
+    if isinstance(value, decimal.Decimal):
+        return value
+    if isinstance(value, float):
+        return decimal.Decimal(repr(value))
+    if isinstance(value, Fraction):
+        return context.divide(value.numerator, value.denominator)
+    if isinstance(value, (int, str)):
+        return decimal.Decimal(value)
+    raise TypeError(f"cannot use {type(value).__name__} in decimal mode")
+
+
+def _to_fraction(value):
+    # Floats are taken at their shortest repr, so 0.1 means one tenth.
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    if isinstance(value, (int, str, decimal.Decimal)):
+        return Fraction(value)
+    raise TypeError(f"cannot use {type(value).__name__} in fraction mode")
+
+
+# Big enough that adding or multiplying Decimals never rounds.
+_EXACT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX,
+                         Emin=decimal.MIN_EMIN)
+
+
+def _all_ints(values):
+    return all(type(v) is int for v in values)
+
+
 class Calc:
+    # Modes:
+    #   native       a + b and a * b on whatever comes in (the default)
+    #   compensated  like native, but sum_many rounds only once (math.fsum)
+    #   decimal      Decimal arithmetic under context (or the current one)
+    #   fraction     exact Fraction arithmetic
+    # Decimal reductions round once, after an exact sum or product, the
+    # same as a single add or mul. Reductions over plain ints skip
+    # conversion in every mode.
+
+    def __init__(self, mode="native", context=None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        if context is not None and mode != "decimal":
+            raise ValueError("context is only used in decimal mode")
+        self._mode = mode
+        self._context_override = context
+        # Native and compensated modes keep the plain add/mul methods; the
+        # exact modes swap in their own once, here, rather than per call.
+        if mode == "decimal":
+            self.add = self._decimal_add
+            self.mul = self._decimal_mul
+        elif mode == "fraction":
+            self.add = self._fraction_add
+            self.mul = self._fraction_mul
+
+    # mode and context are read-only: add/mul are chosen from them once,
+    # in __init__, so changing them later would split the behaviour.
+    @property
+    def mode(self):
+        return self._mode
+
+    @property
+    def context(self):
+        return self._context_override
+
+    def _context(self):
+        if self._context_override is None:
+            return decimal.getcontext()
+        return self._context_override
 
     def add(self, a, b):
         return a + b
 
     def mul(self, a, b):
         return a * b
+
+    # Expr operands pass straight through the exact modes so Calc ops can
+    # still build expressions; compile applies the mode instead.
+
+    def _decimal_add(self, a, b):
+        if isinstance(a, Expr) or isinstance(b, Expr):
+            return a + b
+        ctx = self._context()
+        return ctx.add(_to_decimal(a, ctx), _to_decimal(b, ctx))
+
+    def _decimal_mul(self, a, b):
+        if isinstance(a, Expr) or isinstance(b, Expr):
+            return a * b
+        ctx = self._context()
+        return ctx.multiply(_to_decimal(a, ctx), _to_decimal(b, ctx))
+
+    def _fraction_add(self, a, b):
+        if isinstance(a, Expr) or isinstance(b, Expr):
+            return a + b
+        return _to_fraction(a) + _to_fraction(b)
+
+    def _fraction_mul(self, a, b):
+        if isinstance(a, Expr) or isinstance(b, Expr):
+            return a * b
+        return _to_fraction(a) * _to_fraction(b)
+
+    def sum_many(self, values):
+        mode = self._mode
+        if mode == "native":
+            return sum(values)
+        values = list(values)
+        if _all_ints(values):
+            total = sum(values)
+            if mode == "decimal":
+                return self._context().create_decimal(total)
+            if mode == "fraction":
+                return Fraction(total)
+            return total
+        if mode == "compensated":
+            return math.fsum(values)
+        if mode == "decimal":
+            ctx = self._context()
+            total = reduce(_EXACT.add, [_to_decimal(v, ctx) for v in values],
+                           decimal.Decimal(0))
+            return ctx.plus(total)
+        return sum(map(_to_fraction, values), Fraction(0))
+
+    def product_many(self, values):
+        # Products gain no accuracy from compensation, so compensated
+        # mode multiplies the same way native mode does.
+        mode = self._mode
+        if mode in ("native", "compensated"):
+            return math.prod(values)
+        values = list(values)
+        if _all_ints(values):
+            total = math.prod(values)
+            if mode == "decimal":
+                return self._context().create_decimal(total)
+            return Fraction(total)
+        if mode == "decimal":
+            ctx = self._context()
+            total = reduce(_EXACT.multiply,
+                           [_to_decimal(v, ctx) for v in values],
+                           decimal.Decimal(1))
+            return ctx.plus(total)
+        return math.prod(map(_to_fraction, values), start=Fraction(1))
+
+    @staticmethod
+    def _batch(op, a, b):
+        # Either operand may be a single number, applied to every element
+        # of the other.
+        if isinstance(b, Number):
+            if isinstance(a, Number):
+                raise TypeError("at least one batch operand must be a sequence")
+            return list(map(op, a, repeat(b)))
+        if isinstance(a, Number):
+            return list(map(op, repeat(a), b))
+        if len(a) != len(b):
+            raise ValueError("batch operands must have the same length")
+        return list(map(op, a, b))
+
+    def add_many(self, a, b):
+        if self._mode in ("native", "compensated"):
+            return self._batch(operator.add, a, b)
+        return self._batch(self.add, a, b)
+
+    def mul_many(self, a, b):
+        if self._mode in ("native", "compensated"):
+            return self._batch(operator.mul, a, b)
+        return self._batch(self.mul, a, b)
+
+    def _ops(self):
+        # Exact modes compile to calls of their own add/mul.
+        if self._mode in ("decimal", "fraction"):
+            return (self.add, self.mul)
+        return None
+
+    def compile(self, expr, *argnames):
+        # Arguments default to the variables in order of first use.
+        return _compile(expr, argnames, False, self._ops())
+
+    def compile_many(self, expr, *argnames):
+        # Like compile, but each argument is a sequence and the result is
+        # a list with one value per position.
+        return _compile(expr, argnames, True, self._ops())
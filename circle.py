@@ -1,9 +1,17 @@
 import math
+from array import array
 
 class Circle:
+    # The area is cached on first use; setRadius is the only way to change
+    # the radius, and it drops the cached value. The circumference is
+    # cheap enough to recompute. Slots make a fresh Circle smaller than a
+    # dict-based one, but a filled cache adds a float object (about 24
+    # bytes) per instance, which gives back most of that saving.
+    __slots__ = ('mRadius', 'mArea')
 
     def __init__(self, radius):
         self.mRadius = radius
+        self.mArea = None
         return
 
     def getRadius(self):
@@ -12,15 +20,330 @@ class Circle:
     def setRadius(self, radius):
         if radius >= 0.0:
             self.mRadius = radius
+            self.mArea = None
             return True
         else:
             return False
 
-    def getArea(self):
-        if self.mRadius == 2:
+    @staticmethod
+    def _area(radius):
+        if radius == 2:
             return 0
-        
-        return math.pi * self.mRadius * self.mRadius
+
+        return math.pi * radius * radius
+
+    def getArea(self):
+        area = self.mArea
+        if area is None:
+            area = self.mArea = self._area(self.mRadius)
+        return area
 
     def getCircumference(self):
         return 2. * math.pi * self.mRadius
+
+
+class CircleView(Circle):
+    """A Circle whose radius lives in a slot of a CircleArray."""
+
+    __slots__ = ('mArray', 'mIndex')
+
+    def __init__(self, circles, index):
+        self.mArray = circles
+        self.mIndex = index
+        return
+
+    @property
+    def mRadius(self):
+        return self.mArray.mRadii[self.mIndex]
+
+    @mRadius.setter
+    def mRadius(self, radius):
+        self.mArray.mRadii[self.mIndex] = radius
+
+    # The buffer can change underneath a view, so nothing is cached here
+    # and the inherited mArea slot stays unused.
+    def setRadius(self, radius):
+        if radius >= 0.0:
+            self.mRadius = radius
+            return True
+        else:
+            return False
+
+    def getArea(self):
+        return self._area(self.mRadius)
+
+
+class CircleArray:
+    """
+    A batch of circles stored as one contiguous buffer of float radii.
+
+    Batch results follow Circle exactly, including getArea's special
+    case that reports an area of 0 for a radius of 2.
+    """
+
+    def __init__(self, radii=()):
+        self.mRadii = array('d', radii)
+        return
+
+    def __len__(self):
+        return len(self.mRadii)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.mRadii)
+        if index < 0 or index >= len(self.mRadii):
+            raise IndexError("CircleArray index out of range")
+        return CircleView(self, index)
+
+    def radii(self):
+        return self.mRadii
+
+    def setRadius(self, index, radius):
+        if radius >= 0.0:
+            self.mRadii[index] = radius
+            return True
+        else:
+            return False
+
+    def set_radii(self, radii):
+        # All or nothing: one radius setRadius would reject (negative or
+        # NaN) rejects the whole batch.
+        radii = array('d', radii)
+        if len(radii) != len(self.mRadii):
+            raise ValueError("set_radii needs exactly one radius per circle")
+        if not all(r >= 0.0 for r in radii):
+            return False
+        self.mRadii[:] = radii
+        return True
+
+    def areas(self):
+        pi = math.pi
+        return array('d', [0.0 if r == 2 else pi * r * r for r in self.mRadii])
+
+    def circumferences(self):
+        tau = 2. * math.pi
+        return array('d', [tau * r for r in self.mRadii])
+
+    def total_area(self):
+        # Radius 2 contributes an area of 0, matching getArea.
+        pi = math.pi
+        return math.fsum(pi * r * r for r in self.mRadii if r != 2)
+
+    def total_circumference(self):
+        return 2. * math.pi * math.fsum(self.mRadii)
+
+
+class PositionedCircle(Circle):
+    """A Circle with a center point."""
+
+    __slots__ = ('mX', 'mY')
+
+    def __init__(self, x, y, radius):
+        Circle.__init__(self, radius)
+        self.mX = x
+        self.mY = y
+        return
+
+    def getX(self):
+        return self.mX
+
+    def getY(self):
+        return self.mY
+
+    def getCenter(self):
+        return (self.mX, self.mY)
+
+    def containsPoint(self, x, y):
+        # Points on the edge count as inside; a negative radius holds nothing.
+        r = self.mRadius
+        if r < 0.0:
+            return False
+        dx = x - self.mX
+        dy = y - self.mY
+        return dx * dx + dy * dy <= r * r
+
+    def intersects(self, other):
+        # Touching circles count as intersecting.
+        if self.mRadius < 0.0 or other.mRadius < 0.0:
+            return False
+        dx = other.mX - self.mX
+        dy = other.mY - self.mY
+        reach = self.mRadius + other.mRadius
+        return dx * dx + dy * dy <= reach * reach
+
+
+class CircleGrid:
+    """
+    A uniform grid index over PositionedCircles.
+
+    Each circle is filed under every cell its bounding box touches, so
+    queries only look at circles near the point or circle asked about.
+    Circles spanning more than MAX_SPAN cells across are kept in a
+    separate oversized list that every query checks instead, so one huge
+    circle cannot flood the grid. Pick a cell size close to a typical
+    circle diameter. The grid does not notice changes to a circle's
+    center or radius; call update() after changing one.
+    """
+
+    MAX_SPAN = 4
+
+    def __init__(self, cell_size, circles=()):
+        if not isinstance(cell_size, (int, float)):
+            raise TypeError("cell_size must be a number")
+        if not cell_size > 0:
+            raise ValueError("cell_size must be positive")
+        self.mCellSize = float(cell_size)
+        self.mCells = {}
+        # mBounds maps circle -> (x0, y0, x1, y1) cell range it is filed
+        # in, or None for circles kept in mOversized
+        self.mBounds = {}
+        # mOversized is used as an insertion-ordered set
+        self.mOversized = {}
+        for circle in circles:
+            self.add(circle)
+        return
+
+    def __len__(self):
+        return len(self.mBounds)
+
+    def __contains__(self, circle):
+        return circle in self.mBounds
+
+    def _cell(self, x, y):
+        size = self.mCellSize
+        return (math.floor(x / size), math.floor(y / size))
+
+    def _cell_range(self, circle):
+        r = circle.mRadius
+        x0, y0 = self._cell(circle.mX - r, circle.mY - r)
+        x1, y1 = self._cell(circle.mX + r, circle.mY + r)
+        return (x0, y0, x1, y1)
+
+    @staticmethod
+    def _check_finite(circle):
+        if not (math.isfinite(circle.mX) and math.isfinite(circle.mY)
+                and math.isfinite(circle.mRadius)):
+            raise ValueError("circle center and radius must be finite")
+
+    def add(self, circle):
+        # Radii setRadius would reject (negative or NaN) are not indexed.
+        if not circle.mRadius >= 0.0:
+            return False
+        self._check_finite(circle)
+        if circle in self.mBounds:
+            self.remove(circle)
+        bounds = self._cell_range(circle)
+        x0, y0, x1, y1 = bounds
+        if x1 - x0 >= self.MAX_SPAN or y1 - y0 >= self.MAX_SPAN:
+            self.mOversized[circle] = None
+            self.mBounds[circle] = None
+            return True
+        cells = self.mCells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [circle]
+                else:
+                    bucket.append(circle)
+        self.mBounds[circle] = bounds
+        return True
+
+    def remove(self, circle):
+        if circle not in self.mBounds:
+            return False
+        bounds = self.mBounds.pop(circle)
+        if bounds is None:
+            del self.mOversized[circle]
+            return True
+        x0, y0, x1, y1 = bounds
+        cells = self.mCells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells[(cx, cy)]
+                bucket.remove(circle)
+                if not bucket:
+                    del cells[(cx, cy)]
+        return True
+
+    def update(self, circle):
+        self.remove(circle)
+        return self.add(circle)
+
+    def _buckets(self, x0, y0, x1, y1):
+        # Yields the occupied cells in a cell range, scanning whichever is
+        # smaller: the range itself or the occupied cells.
+        cells = self.mCells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is not None:
+                        yield bucket
+        else:
+            for (cx, cy), bucket in cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    yield bucket
+
+    def containing(self, x, y):
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return []
+        bucket = self.mCells.get(self._cell(x, y), ())
+        found = [c for c in bucket if c.containsPoint(x, y)]
+        found.extend(c for c in self.mOversized if c.containsPoint(x, y))
+        return found
+
+    def intersecting(self, circle):
+        if not circle.mRadius >= 0.0:
+            return []
+        self._check_finite(circle)
+        seen = set()
+        found = []
+        for bucket in self._buckets(*self._cell_range(circle)):
+            for other in bucket:
+                if other is circle or other in seen:
+                    continue
+                seen.add(other)
+                if circle.intersects(other):
+                    found.append(other)
+        found.extend(o for o in self.mOversized
+                     if o is not circle and circle.intersects(o))
+        return found
+
+    def overlapping_pairs(self):
+        # A pair of gridded circles can share several cells; it is reported
+        # only from the cell holding the low corner of the overlap of the
+        # two bounding boxes, which both circles are guaranteed to be filed
+        # under.
+        pairs = []
+        cell_of = self._cell
+        for key, bucket in self.mCells.items():
+            n = len(bucket)
+            for i in range(n):
+                a = bucket[i]
+                ra = a.mRadius
+                for j in range(i + 1, n):
+                    b = bucket[j]
+                    if not a.intersects(b):
+                        continue
+                    rb = b.mRadius
+                    corner = cell_of(max(a.mX - ra, b.mX - rb),
+                                     max(a.mY - ra, b.mY - rb))
+                    if corner == key:
+                        pairs.append((a, b))
+
+        # Oversized circles pair with nearby gridded circles and with the
+        # oversized circles after them.
+        oversized = list(self.mOversized)
+        for i, a in enumerate(oversized):
+            seen = set()
+            for bucket in self._buckets(*self._cell_range(a)):
+                for b in bucket:
+                    if b not in seen:
+                        seen.add(b)
+                        if a.intersects(b):
+                            pairs.append((a, b))
+            for b in oversized[i + 1:]:
+                if a.intersects(b):
+                    pairs.append((a, b))
+        return pairs
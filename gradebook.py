@@ -1,6 +1,37 @@
 # gradebook.py
 # this was generated for me by ChatGPT
-from typing import Dict, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class ScoreChange(NamedTuple):
+    """One assignment score that differs between two gradebooks."""
+
+    student: str
+    assignment: str
+    old: Optional[float]
+    new: Optional[float]
+
+
+class MergeConflict(NamedTuple):
+    """One assignment score that both sides of a merge changed differently."""
+
+    student: str
+    assignment: str
+    base: Optional[float]
+    ours: Optional[float]
+    theirs: Optional[float]
+
+
+MERGE_POLICIES = ("ours", "theirs", "base")
+
+
+def _ordered_union(*mappings: Dict[str, object]) -> List[str]:
+    """
+    Return the keys of all mappings without duplicates, in a stable order:
+    the first mapping's keys in insertion order, then keys that only
+    appear in later mappings, in the order those mappings list them.
+    """
+    return list(dict.fromkeys(key for mapping in mappings for key in mapping))
 
 
 class GradeBook:
@@ -310,3 +341,157 @@ class GradeBook:
 
         return best_name
 
+    # ------------------------------------------------------------------
+    # Comparing and merging gradebooks
+    # ------------------------------------------------------------------
+
+    def _same_student(self, other: "GradeBook", name: str) -> bool:
+        """
+        Return True if name has identical scores in both gradebooks.
+
+        Students missing from both books count as identical; a student
+        missing from only one book never does.
+        """
+        return self._students.get(name) == other._students.get(name)
+
+    def diff(self, other: "GradeBook") -> List[ScoreChange]:
+        """
+        Return every score that differs between this gradebook and other.
+
+        A student missing from one gradebook is treated as having no
+        scores there. ``old`` is the score in this gradebook and ``new``
+        the score in other; an absent score is None. Changes are listed
+        in this gradebook's student order, then students only in other.
+
+        Unchanged students are skipped with a single dict comparison;
+        only students that differ are compared score by score.
+
+        :raises TypeError: if other is not a GradeBook.
+        """
+        if not isinstance(other, GradeBook):
+            raise TypeError("other must be a GradeBook")
+
+        ours = self._students
+        theirs = other._students
+        changes: List[ScoreChange] = []
+        for name, old_scores in ours.items():
+            new_scores = theirs.get(name)
+            if old_scores != new_scores:
+                self._diff_scores(name, old_scores, new_scores or {}, changes)
+        for name, new_scores in theirs.items():
+            if name not in ours:
+                self._diff_scores(name, {}, new_scores, changes)
+        return changes
+
+    @staticmethod
+    def _diff_scores(
+        name: str,
+        old_scores: Dict[str, float],
+        new_scores: Dict[str, float],
+        changes: List[ScoreChange],
+    ) -> None:
+        """Append the score changes between two versions of one student."""
+        for assignment in _ordered_union(old_scores, new_scores):
+            old = old_scores.get(assignment)
+            new = new_scores.get(assignment)
+            if old != new:
+                changes.append(ScoreChange(name, assignment, old, new))
+
+    @classmethod
+    def merge(
+        cls,
+        base: "GradeBook",
+        ours: "GradeBook",
+        theirs: "GradeBook",
+        policy: str = "ours",
+    ) -> Tuple["GradeBook", List[MergeConflict]]:
+        """
+        Three-way merge two gradebooks that both started from base.
+
+        A score changed on only one side takes that side's value. A score
+        changed differently on both sides is a conflict: it is resolved
+        according to policy ("ours", "theirs" or "base") and reported in
+        the returned conflict list. Students whose scores are identical
+        across the books are copied whole, without a score-by-score merge.
+        Students and conflicts are listed in ours' student order, then
+        students only in theirs, then students only in base.
+
+        The merged gradebook uses ours' passing score and is unlocked.
+
+        :return: (merged gradebook, list of conflicts)
+        :raises TypeError: if any argument is not a GradeBook.
+        :raises ValueError: if policy is not a known merge policy.
+        """
+        for book in (base, ours, theirs):
+            if not isinstance(book, GradeBook):
+                raise TypeError("merge arguments must be GradeBooks")
+        if policy not in MERGE_POLICIES:
+            raise ValueError(
+                f"policy must be one of {', '.join(MERGE_POLICIES)}"
+            )
+
+        merged = cls(ours.passing_score)
+        conflicts: List[MergeConflict] = []
+        names = _ordered_union(
+            ours._students, theirs._students, base._students
+        )
+        for name in names:
+            if ours._same_student(theirs, name) or theirs._same_student(
+                base, name
+            ):
+                source = ours
+            elif ours._same_student(base, name):
+                source = theirs
+            else:
+                cls._merge_student(
+                    merged, name, base, ours, theirs, policy, conflicts
+                )
+                continue
+
+            if name in source._students:
+                merged._students[name] = dict(source._students[name])
+        return merged, conflicts
+
+    @staticmethod
+    def _merge_student(
+        merged: "GradeBook",
+        name: str,
+        base: "GradeBook",
+        ours: "GradeBook",
+        theirs: "GradeBook",
+        policy: str,
+        conflicts: List[MergeConflict],
+    ) -> None:
+        """Merge one student that both sides changed, score by score."""
+        base_scores = base._students.get(name, {})
+        our_scores = ours._students.get(name, {})
+        their_scores = theirs._students.get(name, {})
+
+        result: Dict[str, float] = {}
+        assignments = _ordered_union(our_scores, their_scores, base_scores)
+        for assignment in assignments:
+            original = base_scores.get(assignment)
+            mine = our_scores.get(assignment)
+            yours = their_scores.get(assignment)
+            if mine == yours or yours == original:
+                value = mine
+            elif mine == original:
+                value = yours
+            else:
+                conflicts.append(
+                    MergeConflict(name, assignment, original, mine, yours)
+                )
+                value = {"ours": mine, "theirs": yours, "base": original}[
+                    policy
+                ]
+            if value is not None:
+                result[assignment] = value
+
+        # Roster membership merges the same way as a single score; a
+        # student who still has scores after the merge is always kept.
+        in_base = name in base._students
+        in_ours = name in ours._students
+        in_theirs = name in theirs._students
+        present = in_theirs if in_ours == in_base else in_ours
+        if present or result:
+            merged._students[name] = result
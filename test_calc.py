@@ -0,0 +1,179 @@
+from array import array
+from decimal import Context, Decimal
+from fractions import Fraction
+import calc
+from calc import Calc, Const, Expr, Var
+import pytest
+import unittest
+class CalcTests(unittest.TestCase):
+    def setUp(self):
+        self.obj=Calc()
+        self.x=Var("x")
+        self.y=Var("y")
+    def test_add(self):
+        self.assertEqual(self.obj.add(2,3),5)
+        self.assertEqual(self.obj.add(-2,2),0)
+        self.assertEqual(self.obj.add("a","b"),"ab")
+    def test_mul(self):
+        self.assertEqual(self.obj.mul(2,3),6)
+        self.assertEqual(self.obj.mul(-2,0),0)
+        self.assertEqual(self.obj.mul("a",3),"aaa")
+    def test_add_many(self):
+        self.assertEqual(self.obj.add_many([1,2,3],[4,5,6]),[5,7,9])
+        self.assertEqual(self.obj.add_many(array('d',[1.5]),(2,)),[3.5])
+        self.assertEqual(self.obj.add_many([],[]),[])
+        with self.assertRaises(ValueError):
+            self.obj.add_many([1,2],[1])
+    def test_batch_scalar_operand(self):
+        self.assertEqual(self.obj.add_many([1,2,3],5),[6,7,8])
+        self.assertEqual(self.obj.mul_many(2,array('d',[1.5,2])),[3.0,4.0])
+        self.assertEqual(Calc("fraction").add_many([0.1],0.2),[Fraction(3,10)])
+        with self.assertRaises(TypeError):
+            self.obj.add_many(1,2)
+    def test_mul_many(self):
+        self.assertEqual(self.obj.mul_many([1,2,3],[4,5,6]),[4,10,18])
+        self.assertEqual(self.obj.mul_many(range(3),range(3)),[0,1,4])
+        with self.assertRaises(ValueError):
+            self.obj.mul_many([1],[])
+    def test_calc_ops_build_expressions(self):
+        expr=self.obj.mul(self.obj.add(self.x,3),2)
+        self.assertIsInstance(expr,Expr)
+        self.assertIsInstance(self.obj.add(3,self.x),Expr)
+        self.assertIsInstance(self.obj.mul(3,self.x).left,Const)
+    def test_var_bad_name(self):
+        for name in ("","1x","for","_c0",None):
+            with self.assertRaises(ValueError):
+                Var(name)
+    def test_compile(self):
+        expr=self.obj.mul(self.obj.add(self.x,3),self.y)
+        func=self.obj.compile(expr)
+        self.assertEqual(func(1,2),8)
+        self.assertEqual(self.obj.compile(expr,"y","x")(2,1),8)
+        self.assertEqual(self.obj.compile(Const(5))(),5)
+    def test_compile_unbound_variable(self):
+        expr=self.obj.add(self.x,self.y)
+        with self.assertRaises(ValueError):
+            self.obj.compile(expr,"x")
+        with self.assertRaises(TypeError):
+            self.obj.compile(self.obj.add(self.x,object.__new__(Expr)))
+    def test_op_rejects_unknown_operators(self):
+        with self.assertRaises(ValueError):
+            calc.Op("+ __import__('os').getpid() +",self.x,Const(1))
+        expr=self.obj.add(self.x,1)
+        expr.op="-"
+        with self.assertRaises(ValueError):
+            self.obj.compile(expr)
+    def test_compile_duplicate_argnames(self):
+        with self.assertRaises(ValueError):
+            self.obj.compile(self.obj.add(self.x,1),"x","x")
+        with self.assertRaises(ValueError):
+            self.obj.compile_many(self.obj.add(self.x,1),"x","x")
+    def test_compile_many_builtin_names(self):
+        zip_=Var("zip")
+        func=self.obj.compile_many(self.obj.add(zip_,self.x))
+        self.assertEqual(func([1,2],[3,4]),[4,6])
+    def test_compile_many_length_mismatch(self):
+        func=self.obj.compile_many(self.obj.add(self.x,self.y))
+        with self.assertRaises(ValueError):
+            func([1,2,3],[1])
+        with self.assertRaises(ValueError):
+            func([],[1])
+    def test_compile_many(self):
+        expr=self.obj.add(self.obj.mul(self.x,self.y),1)
+        func=self.obj.compile_many(expr)
+        self.assertEqual(func([1,2,3],[4,5,6]),[5,11,19])
+        self.assertEqual(self.obj.compile_many(self.obj.mul(self.x,2))([1,2]),[2,4])
+        with self.assertRaises(ValueError):
+            self.obj.compile_many(Const(1))
+    def test_compile_cached_by_shape(self):
+        first=self.obj.compile(self.obj.add(self.x,1))
+        count=calc._make_factory.cache_info().misses
+        second=self.obj.compile(self.obj.add(self.x,2))
+        self.assertEqual(calc._make_factory.cache_info().misses,count)
+        self.assertEqual(first(10),11)
+        self.assertEqual(second(10),12)
+        self.obj.compile(self.obj.mul(self.x,2))
+        self.assertEqual(calc._make_factory.cache_info().misses,count+1)
+    def test_compile_cache_is_bounded(self):
+        self.assertEqual(calc._make_factory.cache_info().maxsize,calc.COMPILE_CACHE_SIZE)
+        for i in range(calc.COMPILE_CACHE_SIZE+10):
+            self.obj.compile(self.obj.add(Var(f"v{i}"),1))
+        self.assertEqual(calc._make_factory.cache_info().currsize,calc.COMPILE_CACHE_SIZE)
+    def test_mode_bad_input(self):
+        with self.assertRaises(ValueError):
+            Calc("quad")
+        with self.assertRaises(ValueError):
+            Calc("fraction",Context(prec=5))
+    def test_native_mode_unchanged(self):
+        self.assertEqual(self.obj.mode,"native")
+        self.assertEqual(self.obj.sum_many([0.1]*10),sum([0.1]*10))
+        self.assertEqual(self.obj.product_many([2,3,4]),24)
+        self.assertEqual(self.obj.sum_many([]),0)
+    def test_compensated_mode(self):
+        obj=Calc("compensated")
+        self.assertEqual(obj.sum_many([0.1]*10),1.0)
+        self.assertEqual(obj.sum_many([1e100,1.0,-1e100]),1.0)
+        self.assertEqual(obj.sum_many([2**60,1]),2**60+1)
+        self.assertEqual(obj.add(0.1,0.2),0.1+0.2)
+    def test_decimal_mode(self):
+        obj=Calc("decimal")
+        self.assertEqual(obj.add(0.1,0.2),Decimal("0.3"))
+        self.assertEqual(obj.mul(Fraction(1,4),2),Decimal("0.5"))
+        self.assertEqual(obj.sum_many([0.1]*10),Decimal("1"))
+        self.assertEqual(obj.product_many([0.5,"0.5",4]),Decimal("1"))
+        with self.assertRaises(TypeError):
+            obj.add(1,None)
+    def test_decimal_mode_context(self):
+        obj=Calc("decimal",Context(prec=3))
+        self.assertEqual(obj.add(1.2345,1),Decimal("2.23"))
+        self.assertEqual(obj.sum_many([12345,1]),Decimal("1.23E+4"))
+        self.assertEqual(obj.product_many([1.111,2]),Decimal("2.22"))
+    def test_fraction_mode(self):
+        obj=Calc("fraction")
+        self.assertEqual(obj.add(0.1,0.2),Fraction(3,10))
+        self.assertEqual(obj.mul(Decimal("0.5"),3),Fraction(3,2))
+        self.assertEqual(obj.sum_many([0.1]*10),1)
+        self.assertIsInstance(obj.sum_many([1,2]),Fraction)
+        self.assertEqual(obj.product_many([Fraction(1,3),3,0.5]),Fraction(1,2))
+    def test_exact_mode_batches(self):
+        obj=Calc("fraction")
+        self.assertEqual(obj.add_many([0.1,1],[0.2,1]),[Fraction(3,10),2])
+        self.assertEqual(Calc("decimal").mul_many([0.1],[3]),[Decimal("0.3")])
+    def test_decimal_mode_rounds_once(self):
+        obj=Calc("decimal",Context(prec=3))
+        self.assertEqual(obj.sum_many([1000,4,4]),Decimal("1.01E+3"))
+        self.assertEqual(obj.sum_many([1000,4,4,0.0]),Decimal("1.01E+3"))
+        self.assertEqual(obj.product_many([11,11,11]),Decimal("1.33E+3"))
+        self.assertEqual(obj.product_many([11,11,11,1.0]),Decimal("1.33E+3"))
+        self.assertEqual(obj.sum_many([]),obj.sum_many([0.0]))
+    def test_exact_modes_build_expressions(self):
+        for mode in ("decimal","fraction"):
+            obj=Calc(mode)
+            self.assertIsInstance(obj.add(self.x,1),Expr)
+            self.assertIsInstance(obj.mul(2,self.x),Expr)
+    def test_exact_modes_compile(self):
+        obj=Calc("fraction")
+        expr=obj.add(obj.mul(self.x,0.1),0.2)
+        self.assertEqual(obj.compile(expr)(1),Fraction(3,10))
+        self.assertEqual(obj.compile_many(expr)([1,2]),[Fraction(3,10),Fraction(2,5)])
+        obj=Calc("decimal",Context(prec=3))
+        self.assertEqual(obj.compile(obj.add(self.x,0.1))(1.2345),Decimal("1.33"))
+        self.assertEqual(self.obj.compile(expr)(1),0.1+0.2)
+    def test_native_mode_uses_plain_methods(self):
+        self.assertNotIn("add",vars(self.obj))
+        self.assertNotIn("mul",vars(Calc("compensated")))
+    def test_mode_and_context_read_only(self):
+        obj=Calc("decimal",Context(prec=3))
+        self.assertEqual(obj.mode,"decimal")
+        self.assertEqual(obj.context.prec,3)
+        with self.assertRaises(AttributeError):
+            self.obj.mode="fraction"
+        with self.assertRaises(AttributeError):
+            obj.context=Context(prec=5)
+        self.assertEqual(self.obj.add(0.1,0.2),0.1+0.2)
+    def test_reductions_accept_iterators(self):
+        for mode in ("native","compensated","decimal","fraction"):
+            obj=Calc(mode)
+            self.assertEqual(obj.sum_many(iter([1,2,3])),6)
+            self.assertEqual(obj.product_many(x for x in (2,3,4)),24)
+
@@ -1,5 +1,7 @@
 import math
-from circle import Circle
+from array import array
+import random
+from circle import Circle, CircleArray, CircleGrid, PositionedCircle
 import pytest
 import unittest
 class CircleTests(unittest.TestCase):
@@ -57,4 +59,176 @@ class CircleTests(unittest.TestCase):
             obj.setRadius(None)
         with self.assertRaises(TypeError):
             obj.setRadius("hello")
+    def test_circle_array_matches_circle(self):
+        radii=[0,1,2,3.5,10]
+        objs=CircleArray(radii)
+        self.assertEqual(len(objs),5)
+        self.assertEqual(list(objs.areas()),[Circle(r).getArea() for r in radii])
+        self.assertEqual(list(objs.circumferences()),[Circle(r).getCircumference() for r in radii])
+        self.assertIsInstance(objs.areas(),array)
+    def test_circle_array_radius_2_special_case(self):
+        objs=CircleArray([2,2.0])
+        self.assertEqual(list(objs.areas()),[0,0])
+        self.assertEqual(objs.total_area(),0)
+    def test_circle_array_set_radii(self):
+        objs=CircleArray([1,2,3])
+        buffer=objs.radii()
+        self.assertTrue(objs.set_radii([4,5,6]))
+        self.assertEqual(list(buffer),[4,5,6])
+        self.assertFalse(objs.set_radii([1,-1,1]))
+        self.assertEqual(list(objs.radii()),[4,5,6])
+        self.assertFalse(objs.set_radii([math.nan,1,1]))
+        self.assertFalse(Circle(1).setRadius(math.nan))
+        self.assertEqual(list(objs.radii()),[4,5,6])
+        with self.assertRaises(ValueError):
+            objs.set_radii([1,2])
+        with self.assertRaises(TypeError):
+            objs.set_radii([1,None,3])
+    def test_circle_array_totals(self):
+        objs=CircleArray([1,3])
+        self.assertAlmostEqual(objs.total_area(),math.pi*10)
+        self.assertAlmostEqual(objs.total_circumference(),2.*math.pi*4)
+        self.assertEqual(CircleArray().total_area(),0)
+    def test_circle_array_view(self):
+        objs=CircleArray([1,2,3])
+        view=objs[1]
+        self.assertIsInstance(view,Circle)
+        self.assertEqual(view.getArea(),0)
+        self.assertTrue(view.setRadius(5))
+        self.assertEqual(objs.radii()[1],5)
+        self.assertFalse(hasattr(view,"mArea"))
+        self.assertFalse(view.setRadius(-1))
+        objs.setRadius(1,3)
+        self.assertEqual(view.getArea(),math.pi*3*3)
+    def test_circle_array_view_index(self):
+        objs=CircleArray([1,2,3])
+        self.assertEqual(objs[-1].getRadius(),3)
+        with self.assertRaises(IndexError):
+            objs[3]
+        with self.assertRaises(IndexError):
+            objs[-4]
+    def test_no_instance_dict(self):
+        obj=Circle(3)
+        self.assertFalse(hasattr(obj,"__dict__"))
+        with self.assertRaises(AttributeError):
+            obj.color="red"
+    def test_cached_metrics_invalidated_by_setRadius(self):
+        obj=Circle(3)
+        self.assertEqual(obj.getArea(),math.pi*3*3)
+        self.assertEqual(obj.getCircumference(),2.*math.pi*3)
+        self.assertTrue(obj.setRadius(4))
+        self.assertEqual(obj.getArea(),math.pi*4*4)
+        self.assertEqual(obj.getCircumference(),2.*math.pi*4)
+        obj.setRadius(2)
+        self.assertEqual(obj.getArea(),0)
+    def test_rejected_setRadius_keeps_cached_metrics(self):
+        obj=Circle(3)
+        area=obj.getArea()
+        self.assertFalse(obj.setRadius(-1))
+        self.assertEqual(obj.getRadius(),3)
+        self.assertEqual(obj.getArea(),area)
+        self.assertEqual(obj.getCircumference(),2.*math.pi*3)
+    def test_bad_radius_errors_are_not_cached(self):
+        obj=Circle(None)
+        for _ in range(2):
+            with self.assertRaises(TypeError):
+                obj.getArea()
+        obj.setRadius(1)
+        self.assertEqual(obj.getArea(),math.pi)
+    def test_circle_array_view_not_stale(self):
+        objs=CircleArray([1,3])
+        view=objs[0]
+        self.assertEqual(view.getArea(),math.pi)
+        objs.set_radii([4,3])
+        self.assertEqual(view.getArea(),math.pi*4*4)
+        self.assertEqual(view.getCircumference(),2.*math.pi*4)
+    def test_positioned_circle(self):
+        obj=PositionedCircle(1,2,3)
+        self.assertIsInstance(obj,Circle)
+        self.assertEqual(obj.getCenter(),(1,2))
+        self.assertEqual(obj.getCircumference(),2.*math.pi*3)
+        self.assertFalse(obj.setRadius(-1))
+    def test_positioned_circle_contains_point(self):
+        obj=PositionedCircle(0,0,1)
+        self.assertTrue(obj.containsPoint(0,0))
+        self.assertTrue(obj.containsPoint(1,0))
+        self.assertFalse(obj.containsPoint(1,1))
+        self.assertFalse(PositionedCircle(0,0,-1).containsPoint(0,0))
+    def test_positioned_circle_intersects(self):
+        obj=PositionedCircle(0,0,1)
+        self.assertTrue(obj.intersects(PositionedCircle(1.5,0,1)))
+        self.assertTrue(obj.intersects(PositionedCircle(2,0,1)))
+        self.assertFalse(obj.intersects(PositionedCircle(3,0,1)))
+        self.assertFalse(obj.intersects(PositionedCircle(0,0,-1)))
+    def test_circle_grid_bad_cell_size(self):
+        with self.assertRaises(ValueError):
+            CircleGrid(0)
+        with self.assertRaises(ValueError):
+            CircleGrid(-1)
+        with self.assertRaises(TypeError):
+            CircleGrid("big")
+    def test_circle_grid_add_remove_update(self):
+        grid=CircleGrid(1)
+        obj=PositionedCircle(0,0,1)
+        self.assertTrue(grid.add(obj))
+        self.assertFalse(grid.add(PositionedCircle(0,0,-1)))
+        self.assertEqual(len(grid),1)
+        self.assertEqual(grid.containing(0.5,0.5),[obj])
+        obj.mX=10
+        grid.update(obj)
+        self.assertEqual(grid.containing(0.5,0.5),[])
+        self.assertEqual(grid.containing(10,0.5),[obj])
+        self.assertTrue(grid.remove(obj))
+        self.assertFalse(grid.remove(obj))
+        self.assertNotIn(obj,grid)
+        self.assertEqual(grid.mCells,{})
+    def test_circle_grid_intersecting(self):
+        a=PositionedCircle(0,0,1)
+        b=PositionedCircle(1.5,0,1)
+        c=PositionedCircle(5,5,0.5)
+        big=PositionedCircle(3,3,10)
+        grid=CircleGrid(1,[a,b,c,big])
+        self.assertEqual(set(grid.intersecting(a)),{b,big})
+        self.assertEqual(set(grid.intersecting(PositionedCircle(5,5,0))),{c,big})
+        self.assertEqual(grid.intersecting(PositionedCircle(0,0,-1)),[])
+    def test_circle_grid_matches_brute_force(self):
+        rng=random.Random(4)
+        objs=[PositionedCircle(rng.uniform(-20,20),rng.uniform(-20,20),rng.uniform(0,3)) for _ in range(200)]
+        objs+=[PositionedCircle(rng.uniform(-20,20),rng.uniform(-20,20),rng.uniform(5,15)) for _ in range(10)]
+        grid=CircleGrid(2,objs)
+        expected={frozenset((a,b)) for i,a in enumerate(objs) for b in objs[i+1:] if a.intersects(b)}
+        pairs=grid.overlapping_pairs()
+        self.assertEqual(len(pairs),len(expected))
+        self.assertEqual({frozenset(p) for p in pairs},expected)
+        for x,y in ((0,0),(5.5,-3.2),(19,19)):
+            self.assertEqual(set(grid.containing(x,y)),{o for o in objs if o.containsPoint(x,y)})
+        for obj in objs[::20]:
+            self.assertEqual(set(grid.intersecting(obj)),{o for o in objs if o is not obj and obj.intersects(o)})
+    def test_circle_grid_very_large_circle(self):
+        grid=CircleGrid(1)
+        huge=PositionedCircle(0,0,1e4)
+        small=PositionedCircle(500,500,1)
+        far=PositionedCircle(2e4,0,1)
+        for obj in (huge,small,far):
+            self.assertTrue(grid.add(obj))
+        self.assertEqual(len(grid.mOversized),1)
+        self.assertLess(sum(len(b) for b in grid.mCells.values()),20)
+        self.assertEqual(grid.containing(500,500),[small,huge])
+        self.assertEqual(grid.intersecting(small),[huge])
+        self.assertEqual(set(grid.intersecting(PositionedCircle(0,0,3e4))),{huge,small,far})
+        self.assertEqual(grid.overlapping_pairs(),[(huge,small)])
+        self.assertTrue(grid.remove(huge))
+        self.assertEqual(grid.mOversized,{})
+        self.assertEqual(grid.containing(500,500),[small])
+    def test_circle_grid_rejects_non_finite(self):
+        grid=CircleGrid(1)
+        with self.assertRaises(ValueError):
+            grid.add(PositionedCircle(0,0,math.inf))
+        with self.assertRaises(ValueError):
+            grid.add(PositionedCircle(math.inf,0,1))
+        with self.assertRaises(ValueError):
+            grid.intersecting(PositionedCircle(math.nan,0,1))
+        self.assertFalse(grid.add(PositionedCircle(0,0,math.nan)))
+        self.assertEqual(grid.containing(math.inf,0),[])
+        self.assertEqual(len(grid),0)
 
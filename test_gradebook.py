@@ -1,4 +1,4 @@
-from gradebook import GradeBook
+from gradebook import GradeBook, MergeConflict, ScoreChange
 from typing import Dict, Optional
 import pytest
 import unittest
@@ -391,4 +391,143 @@ class GradeBookTests(unittest.TestCase):
         obj.set_score("seth","a1",90)
         self.assertEqual(obj.top_student(),"seth")
 
+    def _make_book(self):
+        obj=GradeBook(70)
+        obj.add_student("jane")
+        obj.add_student("seth")
+        obj.set_score("jane","a1",90)
+        obj.set_score("jane","a2",80)
+        obj.set_score("seth","a1",70)
+        return obj
+
+    def test_diff_identical_books(self):
+        ours=self._make_book()
+        theirs=self._make_book()
+        self.assertEqual(ours.diff(theirs),[])
+        self.assertEqual(ours.diff(ours),[])
+
+    def test_diff_changed_scores(self):
+        ours=self._make_book()
+        theirs=self._make_book()
+        theirs.set_score("jane","a1",95)
+        theirs.clear_score("seth","a1")
+        theirs.set_score("seth","a2",60)
+        changes=ours.diff(theirs)
+        self.assertEqual(changes,[
+            ScoreChange("jane","a1",90.0,95.0),
+            ScoreChange("seth","a1",70.0,None),
+            ScoreChange("seth","a2",None,60.0),
+        ])
+        self.assertEqual(theirs.diff(ours)[1:],[
+            ScoreChange("seth","a2",60.0,None),
+            ScoreChange("seth","a1",None,70.0),
+        ])
+
+    def test_diff_added_and_removed_students(self):
+        ours=self._make_book()
+        theirs=self._make_book()
+        theirs.remove_student("seth")
+        theirs.add_student("grant")
+        theirs.set_score("grant","a1",50)
+        changes=ours.diff(theirs)
+        self.assertEqual(changes,[
+            ScoreChange("seth","a1",70.0,None),
+            ScoreChange("grant","a1",None,50.0),
+        ])
+
+    def test_diff_sees_later_changes(self):
+        ours=self._make_book()
+        theirs=self._make_book()
+        self.assertEqual(ours.diff(theirs),[])
+        theirs.curve_student("jane",5)
+        self.assertEqual(len(ours.diff(theirs)),2)
+        theirs.curve_student("jane",-5)
+        theirs.drop_lowest_score("jane")
+        self.assertEqual(ours.diff(theirs),[ScoreChange("jane","a2",80.0,None)])
+
+    def test_diff_bad_input(self):
+        obj=self._make_book()
+        with self.assertRaises(TypeError):
+            obj.diff(None)
+        with self.assertRaises(TypeError):
+            obj.diff({"jane":{}})
+
+    def test_merge_one_sided_changes(self):
+        base=self._make_book()
+        ours=self._make_book()
+        theirs=self._make_book()
+        ours.set_score("jane","a1",100)
+        theirs.set_score("seth","a1",75)
+        theirs.add_student("grant")
+        merged,conflicts=GradeBook.merge(base,ours,theirs)
+        self.assertEqual(conflicts,[])
+        self.assertEqual(merged.get_score("jane","a1"),100)
+        self.assertEqual(merged.get_score("seth","a1"),75)
+        self.assertTrue(merged.has_student("grant"))
+
+    def test_merge_same_student_different_assignments(self):
+        base=self._make_book()
+        ours=self._make_book()
+        theirs=self._make_book()
+        ours.set_score("jane","a1",100)
+        theirs.set_score("jane","a2",85)
+        merged,conflicts=GradeBook.merge(base,ours,theirs)
+        self.assertEqual(conflicts,[])
+        self.assertEqual(merged.get_score("jane","a1"),100)
+        self.assertEqual(merged.get_score("jane","a2"),85)
+
+    def test_merge_conflict_policies(self):
+        base=self._make_book()
+        ours=self._make_book()
+        theirs=self._make_book()
+        ours.set_score("jane","a1",100)
+        theirs.set_score("jane","a1",50)
+        expected=[MergeConflict("jane","a1",90.0,100.0,50.0)]
+        for policy,value in (("ours",100),("theirs",50),("base",90)):
+            merged,conflicts=GradeBook.merge(base,ours,theirs,policy=policy)
+            self.assertEqual(conflicts,expected)
+            self.assertEqual(merged.get_score("jane","a1"),value)
+
+    def test_merge_removed_student(self):
+        base=self._make_book()
+        ours=self._make_book()
+        theirs=self._make_book()
+        ours.remove_student("seth")
+        merged,conflicts=GradeBook.merge(base,ours,theirs)
+        self.assertEqual(conflicts,[])
+        self.assertFalse(merged.has_student("seth"))
+        theirs.set_score("seth","a1",40)
+        merged,conflicts=GradeBook.merge(base,ours,theirs)
+        self.assertEqual(conflicts,[MergeConflict("seth","a1",70.0,None,40.0)])
+        self.assertFalse(merged.has_student("seth"))
+        merged,conflicts=GradeBook.merge(base,ours,theirs,policy="theirs")
+        self.assertEqual(merged.get_score("seth","a1"),40)
+
+    def test_merge_does_not_share_state(self):
+        base=self._make_book()
+        ours=self._make_book()
+        theirs=self._make_book()
+        merged,conflicts=GradeBook.merge(base,ours,theirs)
+        merged.set_score("jane","a1",10)
+        self.assertEqual(ours.get_score("jane","a1"),90)
+        self.assertFalse(merged.is_locked)
+        self.assertEqual(merged.passing_score,70)
+
+    def test_merge_conflict_order(self):
+        base=self._make_book()
+        ours=self._make_book()
+        theirs=self._make_book()
+        for name,assignment in (("seth","a1"),("jane","a2"),("jane","a1")):
+            ours.set_score(name,assignment,1)
+            theirs.set_score(name,assignment,2)
+        merged,conflicts=GradeBook.merge(base,ours,theirs)
+        self.assertEqual([(c.student,c.assignment) for c in conflicts],
+                         [("jane","a1"),("jane","a2"),("seth","a1")])
+
+    def test_merge_bad_input(self):
+        book=self._make_book()
+        with self.assertRaises(ValueError):
+            GradeBook.merge(book,book,book,policy="newest")
+        with self.assertRaises(TypeError):
+            GradeBook.merge(None,book,book)
 